@@ -2,13 +2,27 @@
 Core engine for Cursor Rules Framework.
 """
 
+import codecs
 import json
+import locale
 import logging
-from typing import Dict, List, Optional, Any
+import mmap
+import os
+from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
 
 logger = logging.getLogger(__name__)
 
+# Bytes fed to the incremental decoder per step when checking a mapped file
+DECODE_CHUNK_BYTES = 1 << 20
+
+# Optional: single-pass multi-pattern matching
+try:
+    import ahocorasick  # type: ignore[import-not-found]
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
 
 @dataclass
 class Rule:
@@ -26,6 +40,11 @@ class CursorRulesEngine:
     
     def __init__(self, rules_file: Optional[str] = None):
         self.rules: List[Rule] = []
+        self._automaton: Any = None
+        self._pattern_bytes: List[bytes] = []
+        self._multiline = False
+        self._bytes_safe = False
+        self._compiled_key: Optional[Tuple[str, ...]] = None
         if rules_file:
             self.load_rules(rules_file)
     
@@ -35,25 +54,86 @@ class CursorRulesEngine:
             with open(rules_file, 'r') as f:
                 rules_data = json.load(f)
             self.rules = [Rule(**rule) for rule in rules_data.get('rules', [])]
+            self._compile_rules([r for r in self.rules if r.enabled])
         except Exception as e:
             logger.error(f"Failed to load rules: {e}")
             raise
     
+    def _compile_rules(self, rules: List[Rule]) -> None:
+        """Pre-encode the enabled rules' patterns and build the Aho-Corasick automaton."""
+        self._compiled_key = tuple(r.pattern for r in rules)
+        self._pattern_bytes = [r.pattern.encode('utf-8') for r in rules]
+        self._multiline = any('\n' in r.pattern for r in rules)
+        # Raw bytes give the same hits as text mode only for UTF-8 text and for
+        # patterns that universal-newline translation cannot affect
+        self._bytes_safe = (
+            codecs.lookup(locale.getpreferredencoding(False)).name == 'utf-8'
+            and not any('\n' in r.pattern or '\r' in r.pattern for r in rules)
+        )
+        self._automaton = None
+        if not AHOCORASICK_AVAILABLE:
+            return
+        automaton = ahocorasick.Automaton()
+        for index, rule in enumerate(rules):
+            if not rule.pattern:
+                continue
+            if rule.pattern in automaton:
+                automaton.get(rule.pattern).append(index)
+            else:
+                automaton.add_word(rule.pattern, [index])
+        if len(automaton):
+            automaton.make_automaton()
+            self._automaton = automaton
+
+    def _matching_rules(self, rules: List[Rule], file_path: str) -> List[Rule]:
+        """Return the rules whose pattern occurs in the file, in rule order."""
+        # Rules may be appended to self.rules directly, so recompile on any change
+        if self._compiled_key != tuple(r.pattern for r in rules):
+            self._compile_rules(rules)
+        if os.path.getsize(file_path) == 0:
+            return [r for r in rules if not r.pattern]
+
+        if self._automaton is not None:
+            hits = {i for i, r in enumerate(rules) if not r.pattern}
+            with open(file_path, 'r') as f:
+                # Patterns without a newline cannot span lines, so stream line by
+                # line and stop matching once every rule has matched
+                chunks = (f.read(),) if self._multiline else f
+                for chunk in chunks:
+                    for _, indices in self._automaton.iter(chunk):
+                        hits.update(indices)
+                    if len(hits) == len(rules):
+                        break
+                # Still decode the rest so undecodable files fail as f.read() does
+                for _ in chunks:
+                    pass
+            return [r for i, r in enumerate(rules) if i in hits]
+
+        if not self._bytes_safe:
+            with open(file_path, 'r') as f:
+                content = f.read()
+            return [r for r in rules if r.pattern in content]
+
+        # Substring scans run on the mapped bytes without building a str of the file
+        with open(file_path, 'rb') as fb, mmap.mmap(fb.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # Undecodable files fail here exactly as f.read() does on the text paths
+            decoder = codecs.getincrementaldecoder('utf-8')()
+            for start in range(0, len(mm), DECODE_CHUNK_BYTES):
+                decoder.decode(mm[start:start + DECODE_CHUNK_BYTES])
+            decoder.decode(b'', final=True)
+            return [r for r, pat in zip(rules, self._pattern_bytes) if mm.find(pat) != -1]
+
     def validate_file(self, file_path: str) -> List[Dict[str, Any]]:
         """Validate a file against all enabled rules."""
         results = []
         try:
-            with open(file_path, 'r') as f:
-                content = f.read()
-            
-            for rule in [r for r in self.rules if r.enabled]:
-                if rule.pattern in content:
-                    results.append({
-                        'rule_name': rule.name,
-                        'severity': rule.severity,
-                        'message': rule.message,
-                        'file': file_path
-                    })
+            for rule in self._matching_rules([r for r in self.rules if r.enabled], file_path):
+                results.append({
+                    'rule_name': rule.name,
+                    'severity': rule.severity,
+                    'message': rule.message,
+                    'file': file_path
+                })
         except Exception as e:
             logger.error(f"Error validating file {file_path}: {e}")
         
@@ -83,6 +83,56 @@ def test_file_validation():
         os.unlink(temp_file)
 
 
+@pytest.mark.parametrize("use_automaton", [True, False])
+def test_file_validation_multiple_rules(monkeypatch, use_automaton):
+    """Test that each matching rule is reported once, in rule order."""
+    from src import core
+    if use_automaton and not core.AHOCORASICK_AVAILABLE:
+        pytest.skip("pyahocorasick not installed")
+    monkeypatch.setattr(core, "AHOCORASICK_AVAILABLE", use_automaton)
+
+    engine = CursorRulesEngine()
+    engine.rules.append(Rule("print_rule", "Find prints", "info", "print(", "Found print"))
+    engine.rules.append(Rule("todo_rule", "Find TODOs", "warning", "TODO", "Found TODO"))
+    engine.rules.append(Rule("todo_colon_rule", "Find TODO:", "warning", "TODO:", "Found TODO:"))
+    engine.rules.append(Rule("fixme_rule", "Find FIXMEs", "warning", "FIXME", "Found FIXME"))
+    engine.rules.append(Rule("off_rule", "Disabled", "error", "hello", "Found hello", enabled=False))
+
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
+        f.write("# TODO: one\n# TODO: two\nprint('hello')")
+        temp_file = f.name
+
+    try:
+        results = engine.validate_file(temp_file)
+        assert [r['rule_name'] for r in results] == ["print_rule", "todo_rule", "todo_colon_rule"]
+
+        # Rules added after the first validation are picked up
+        engine.rules.append(Rule("hello_rule", "Find hello", "info", "hello", "Found hello"))
+        results = engine.validate_file(temp_file)
+        assert [r['rule_name'] for r in results][-1] == "hello_rule"
+
+        # CRLF files are matched after newline translation, as in text mode
+        with open(temp_file, 'wb') as f:
+            f.write(b"# TODO\r\nx")
+        engine.rules.append(Rule("todo_x_rule", "Find TODO then x", "info", "TODO\nx", "Found TODO/x"))
+        results = engine.validate_file(temp_file)
+        assert [r['rule_name'] for r in results] == ["todo_rule", "todo_x_rule"]
+        engine.rules.pop()
+        results = engine.validate_file(temp_file)
+        assert [r['rule_name'] for r in results] == ["todo_rule"]
+
+        # Files that are not valid UTF-8 report no results on every path
+        with open(temp_file, 'wb') as f:
+            f.write(b"# TODO \xff\xfe")
+        assert engine.validate_file(temp_file) == []
+        # ...even when the bad bytes come after every rule has already matched
+        with open(temp_file, 'wb') as f:
+            f.write(b"# TODO: FIXME print('hello')\n" + b"x\n" * 50000 + b"\xff")
+        assert engine.validate_file(temp_file) == []
+    finally:
+        os.unlink(temp_file)
+
+
 if __name__ == "__main__":
     # Run basic tests
     test_rule_creation()
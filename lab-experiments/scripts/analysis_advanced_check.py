@@ -1,19 +1,48 @@
 #!/usr/bin/env python3
 # analysis_advanced_check.py
-import argparse, json, os, re, math, itertools
-from collections import Counter, defaultdict
-from typing import List, Dict, Tuple
+import argparse, hashlib, json, os, re, math, itertools, sqlite3
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Dict, Iterator, Optional, Tuple, Union
+
+# Optional: pairwise phase similarity as one matrix product
+try:
+	import numpy as np
+	NUMPY_AVAILABLE = True
+except ImportError:
+	NUMPY_AVAILABLE = False
+
+# Optional: faster JSON parsing straight from bytes
+try:
+	import orjson
+	ORJSON_AVAILABLE = True
+except ImportError:
+	ORJSON_AVAILABLE = False
 
 SECTION_KEYS = ["Purpose:", "Scope:", "Checks:", "IMPORTANT NOTE:"]
 
+_PHASE_RE = re.compile(r"PHASE\s+(\d+):", re.IGNORECASE)
+# Capture blocks after "- Concern:" with subsequent Type/Similarity/Evidence
+_FINDING_RE = re.compile(
+	r"-\s*Concern:\s*(?P<concern>[^\n]+)\n\s*Type:\s*(?P<type>[^\n]+)\n\s*Similarity:\s*(?P<sim>[0-9.]+)\n\s*Evidence:\s*(?P<evidence>(?:\n\s*-\s*[^\n]+)+)",
+	re.IGNORECASE
+)
+_PUNCT_RE = re.compile(r"[^\w\s]+")
+# Minimal stoplist
+_STOP = frozenset({"the","and","for","with","that","this","are","not","only","but","also","when","from","into","your","their","have","has","had","will","shall","must","should","could","would","can"})
+
 def load_json(path: str) -> List[Dict]:
 	if not os.path.exists(path):
 		raise FileNotFoundError(f"File not found: {path}")
-	with open(path, "r", encoding="utf-8") as f:
-		return json.load(f)
+	with open(path, "rb") as f:
+		raw = f.read()
+	if ORJSON_AVAILABLE:
+		return orjson.loads(raw)
+	return json.loads(raw.decode("utf-8"))
 
 def extract_phase_index(text: str) -> int:
-	m = re.search(r"PHASE\s+(\d+):", text, flags=re.IGNORECASE)
+	m = _PHASE_RE.search(text)
 	return int(m.group(1)) if m else -1
 
 def has_section(text: str, marker: str) -> bool:
@@ -21,12 +50,11 @@ def has_section(text: str, marker: str) -> bool:
 
 def extract_findings(text: str) -> List[Dict]:
 	findings: List[Dict] = []
-	# Capture blocks after "- Concern:" with subsequent Type/Similarity/Evidence
-	pattern = re.compile(
-		r"-\s*Concern:\s*(?P<concern>[^\n]+)\n\s*Type:\s*(?P<type>[^\n]+)\n\s*Similarity:\s*(?P<sim>[0-9.]+)\n\s*Evidence:\s*(?P<evidence>(?:\n\s*-\s*[^\n]+)+)",
-		re.IGNORECASE
-	)
-	for m in pattern.finditer(text):
+	# Most phases carry no findings; a lowercase substring check is far cheaper
+	# than letting the multi-line regex try every "-" in the text
+	if "concern:" not in text.lower():
+		return findings
+	for m in _FINDING_RE.finditer(text):
 		ev_lines = [ln.strip()[2:].strip() for ln in m.group("evidence").strip().splitlines() if ln.strip().startswith("-")]
 		findings.append({
 			"concern": m.group("concern").strip(),
@@ -36,39 +64,145 @@ def extract_findings(text: str) -> List[Dict]:
 		})
 	return findings
 
+def _iter_tokens(text: str) -> Iterator[str]:
+	return (t for t in _PUNCT_RE.sub(" ", text.lower()).split() if len(t) > 2 and t not in _STOP)
+
 def normalize(text: str) -> List[str]:
-	text = text.lower()
-	text = re.sub(r"[^\w\s]+", " ", text)
-	tokens = [t for t in text.split() if len(t) > 2]
-	# Minimal stoplist
-	stop = {"the","and","for","with","that","this","are","not","only","but","also","when","from","into","your","their","have","has","had","will","shall","must","should","could","would","can"}
-	return [t for t in tokens if t not in stop]
+	return list(_iter_tokens(text))
 
 def bow(text: str) -> Counter:
-	return Counter(normalize(text))
+	# Counter consumes the token generator directly; no intermediate list
+	return Counter(_iter_tokens(text))
+
+def _norm(a: Counter) -> float:
+	return math.sqrt(sum(v*v for v in a.values()))
+
+def _dot(a: Counter, b: Counter) -> int:
+	# Keys outside the intersection contribute 0, so walk the smaller bag only
+	small, large = (a, b) if len(a) <= len(b) else (b, a)
+	return sum(v*large[k] for k, v in small.items() if k in large)
+
+def _cosine_normed(a: Counter, da: float, b: Counter, db: float) -> float:
+	return 0.0 if da == 0 or db == 0 else _dot(a, b)/(da*db)
 
 def cosine(a: Counter, b: Counter) -> float:
 	if not a or not b:
 		return 0.0
-	keys = set(a) | set(b)
-	num = sum(a[k]*b[k] for k in keys)
-	da = math.sqrt(sum(v*v for v in a.values()))
-	db = math.sqrt(sum(v*v for v in b.values()))
-	return 0.0 if da == 0 or db == 0 else num/(da*db)
+	return _cosine_normed(a, _norm(a), b, _norm(b))
 
-def phase_summary(todo: Dict) -> Dict:
-	text = todo.get("text","")
-	phase = extract_phase_index(text)
-	sections_present = {k: has_section(text, k) for k in SECTION_KEYS}
-	findings = extract_findings(text)
+@lru_cache(maxsize=None)
+def _summarize_cached(text: str) -> Dict:
+	# Everything phase_summary derives from the text; repeated todos hit this cache
 	return {
-		"phase": phase,
-		"sections_present": sections_present,
-		"findings": findings,
-		"text": text,
+		"phase": extract_phase_index(text),
+		# Four C-level substring searches beat one alternation regex pass over the text
+		"sections_present": {k: k in text for k in SECTION_KEYS},
+		"findings": extract_findings(text),
 		"bow": bow(text),
 	}
 
+def _summarize(text: str) -> Dict:
+	# The cached summary is shared across calls, so hand out fresh containers
+	s = _summarize_cached(text)
+	return {
+		"phase": s["phase"],
+		"sections_present": dict(s["sections_present"]),
+		"findings": [dict(f, evidence=list(f["evidence"])) for f in s["findings"]],
+		"bow": Counter(s["bow"]),
+	}
+
+def phase_summary(todo: Dict) -> Dict:
+	text = todo.get("text","")
+	return dict(_summarize(text), text=text)
+
+# Bump when _summarize's output changes so stale on-disk summaries are dropped
+SUMMARY_CACHE_VERSION = 2
+
+_FINDING_KEYS: Dict[str, Union[type, Tuple[type, ...]]] = {"concern": str, "type": str, "similarity": (int, float), "evidence": list}
+
+def _encode_summary(summary: Dict) -> str:
+	return json.dumps(dict(summary, bow=dict(summary["bow"])))
+
+def _decode_summary(raw: object) -> Optional[Dict]:
+	# The cache file lives in the plan's directory, so treat rows as untrusted:
+	# plain JSON only, and anything not shaped like _summarize's output is a miss
+	if not isinstance(raw, str):
+		return None
+	try:
+		data = json.loads(raw)
+	except ValueError:
+		return None
+	if not isinstance(data, dict) or set(data) != {"phase", "sections_present", "findings", "bow"}:
+		return None
+	phase, sections, findings, bag = data["phase"], data["sections_present"], data["findings"], data["bow"]
+	if type(phase) is not int:
+		return None
+	if not isinstance(sections, dict) or list(sections) != SECTION_KEYS or not all(isinstance(v, bool) for v in sections.values()):
+		return None
+	if not isinstance(findings, list) or not all(
+		isinstance(f, dict) and set(f) == set(_FINDING_KEYS) and all(isinstance(f[k], t) for k, t in _FINDING_KEYS.items())
+		and all(isinstance(e, str) for e in f["evidence"])
+		for f in findings
+	):
+		return None
+	if not isinstance(bag, dict) or not all(type(v) is int for v in bag.values()):
+		return None
+	data["bow"] = Counter(bag)
+	return data
+
+def _summary_key(text: str) -> str:
+	return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+def _open_summary_cache(path: Path) -> Optional[sqlite3.Connection]:
+	try:
+		path.parent.mkdir(parents=True, exist_ok=True)
+		conn = sqlite3.connect(str(path))
+		if conn.execute("PRAGMA user_version").fetchone()[0] != SUMMARY_CACHE_VERSION:
+			conn.execute("DROP TABLE IF EXISTS summaries")
+			conn.execute(f"PRAGMA user_version = {SUMMARY_CACHE_VERSION}")
+		conn.execute("CREATE TABLE IF NOT EXISTS summaries (key TEXT PRIMARY KEY, summary TEXT)")
+		return conn
+	except Exception:
+		return None
+
+def summarize_phases(todos: List[Dict], cache_path: Optional[Path] = None) -> List[Dict]:
+	"""phase_summary for every todo, reusing summaries cached on disk by text hash.
+
+	The sqlite file at cache_path is created if missing and only keeps the
+	summaries of these todos; pass None to neither read nor write it.
+	"""
+	conn = _open_summary_cache(cache_path) if cache_path is not None else None
+	texts = [td.get("text","") for td in todos]
+	keys = [_summary_key(text) for text in texts]
+	cached: Dict[str, str] = {}
+	if conn is not None:
+		try:
+			# Look up only the current todos' keys rather than loading the whole table
+			conn.execute("CREATE TEMP TABLE live (key TEXT PRIMARY KEY)")
+			conn.executemany("INSERT OR IGNORE INTO live (key) VALUES (?)", ((k,) for k in keys))
+			cached = dict(conn.execute("SELECT key, summary FROM summaries JOIN live USING (key)"))
+		except Exception:
+			pass
+	phases: List[Dict] = []
+	fresh: Dict[str, str] = {}
+	for text, key in zip(texts, keys):
+		summary = _decode_summary(cached[key]) if key in cached else None
+		if summary is None:
+			summary = _summarize(text)
+			fresh[key] = _encode_summary(summary)
+		phases.append(dict(summary, text=text))
+	if conn is not None:
+		try:
+			with conn:
+				# Drop summaries of todos that were edited or removed since the last run
+				conn.execute("DELETE FROM summaries WHERE key NOT IN (SELECT key FROM live)")
+				conn.executemany("INSERT OR REPLACE INTO summaries (key, summary) VALUES (?, ?)", fresh.items())
+		except Exception:
+			pass
+		finally:
+			conn.close()
+	return phases
+
 def status_for_phase(p: Dict) -> Tuple[str, List[str]]:
 	missing = [name for name, present in p["sections_present"].items() if not present]
 	conflicts = [f["concern"] for f in p["findings"] if f["type"].lower() == "conflict"]
@@ -80,10 +214,78 @@ def status_for_phase(p: Dict) -> Tuple[str, List[str]]:
 	if conflicts: fail_reasons.append("Conflicts in Findings: " + ", ".join(conflicts))
 	return ("FAIL" if fail_reasons else "PASS", fail_reasons)
 
-def cross_phase_similarity(phases: List[Dict], dup_threshold=0.80, overlap_threshold=0.55):
+def similarity_matrix(bows: List[Counter]):
+	"""Cosine similarity of every pair of bags of words via one dense GEMM."""
+	vocab = {tok: i for i, tok in enumerate(set().union(*bows))}
+	counts = np.zeros((len(bows), len(vocab)))
+	for r, b in enumerate(bows):
+		counts[r, [vocab[t] for t in b]] = list(b.values())
+	# Counts are small integers, so the Gram matrix is exact and matches cosine()
+	gram = counts @ counts.T
+	norms = np.sqrt(np.diag(gram))
+	denom = np.outer(norms, norms)
+	with np.errstate(divide="ignore", invalid="ignore"):
+		return np.where(denom > 0, gram / denom, 0.0)
+
+SIMHASH_BITS = 64
+
+@lru_cache(maxsize=None)
+def _token_hash(tok: str) -> int:
+	# blake2b rather than hash(): str hashes are salted per process
+	return int.from_bytes(hashlib.blake2b(tok.encode("utf-8"), digest_size=8).digest(), "little")
+
+# Width of one per-bit counter in _token_lanes(); bags must weigh less than 2**_LANE_BITS
+_LANE_BITS = 48
+_LANE_MASK = (1 << _LANE_BITS) - 1
+
+@lru_cache(maxsize=None)
+def _token_lanes(tok: str) -> int:
+	# The token's hash bits spread one per lane, so a weighted sum of lanes
+	# counts, for every bit at once, how much weight has that bit set
+	h = _token_hash(tok)
+	return sum(1 << (i * _LANE_BITS) for i in range(SIMHASH_BITS) if (h >> i) & 1)
+
+def simhash(b: Counter) -> int:
+	"""Charikar SimHash of a bag of words; differing bits track the angle between two bags."""
+	total = sum(b.values())
+	lanes = sum(w * _token_lanes(tok) for tok, w in b.items())
+	# Bit i is set when the weight with bit i set outweighs the weight without it
+	return sum(1 << i for i in range(SIMHASH_BITS) if 2 * ((lanes >> (i * _LANE_BITS)) & _LANE_MASK) > total)
+
+def _simhash_max_distance(threshold: float) -> float:
+	# A bit differs with probability angle/pi; one standard deviation of slack keeps
+	# most pairs at the threshold while rejecting most unrelated ones
+	p = math.acos(min(1.0, threshold)) / math.pi
+	return SIMHASH_BITS * p + math.sqrt(SIMHASH_BITS * p * (1 - p))
+
+def _similar_pairs(phases: List[Dict], dup_threshold: float, overlap_threshold: float, approx: bool = False):
+	threshold = min(dup_threshold, overlap_threshold)
+	if NUMPY_AVAILABLE:
+		# One GEMM scores every pair faster than fingerprints could prune them,
+		# so approx only applies to the pure-Python path
+		sims = similarity_matrix([p["bow"] for p in phases])
+		mask = (sims >= dup_threshold) | (sims >= overlap_threshold)
+		# np.nonzero walks the upper triangle row-major, i.e. in combinations() order
+		for i, j in zip(*np.nonzero(np.triu(mask, k=1))):
+			yield phases[i], phases[j], float(sims[i, j])
+		return
+	if approx and threshold > 0:
+		# Only pairs whose fingerprints are close enough get an exact cosine
+		max_dist = _simhash_max_distance(threshold)
+		hashed = [(p, p["bow"], _norm(p["bow"]), simhash(p["bow"])) for p in phases]
+		for (a, ba, da, sa), (b, bb, db, sb) in itertools.combinations(hashed, 2):
+			if bin(sa ^ sb).count("1") <= max_dist:
+				yield a, b, _cosine_normed(ba, da, bb, db)
+		return
+	# Norms are computed once per phase, not once per pair
+	normed = [(p, p["bow"], _norm(p["bow"])) for p in phases]
+	for (a, ba, da), (b, bb, db) in itertools.combinations(normed, 2):
+		yield a, b, _cosine_normed(ba, da, bb, db)
+
+def cross_phase_similarity(phases: List[Dict], dup_threshold=0.80, overlap_threshold=0.55, approx=False):
 	pairs = []
-	for a, b in itertools.combinations(sorted(phases, key=lambda x: x["phase"]), 2):
-		sim = cosine(a["bow"], b["bow"])
+	ordered = sorted(phases, key=lambda x: x["phase"])
+	for a, b, sim in _similar_pairs(ordered, dup_threshold, overlap_threshold, approx):
 		tag = "none"
 		if sim >= dup_threshold: tag = "duplicate"
 		elif sim >= overlap_threshold: tag = "overlap"
@@ -92,17 +294,22 @@ def cross_phase_similarity(phases: List[Dict], dup_threshold=0.80, overlap_thres
 	return pairs
 
 def concern_collisions(phases: List[Dict]) -> Dict[str, List[Tuple[int, str]]]:
-	by_concern = defaultdict(list)
+	# Count first so lists are only built for concerns that actually collide
+	counts = Counter(f["concern"] for p in phases for f in p["findings"])
+	by_concern: Dict[str, List[Tuple[int, str]]] = {}
 	for p in phases:
 		for f in p["findings"]:
-			by_concern[f["concern"]].append((p["phase"], f["type"]))
-	return {k: v for k, v in by_concern.items() if len(v) > 1}
+			if counts[f["concern"]] > 1:
+				by_concern.setdefault(f["concern"], []).append((p["phase"], f["type"]))
+	return by_concern
 
 def main():
 	ap = argparse.ArgumentParser()
 	ap.add_argument("--file", default="/workspace/memory-bank/queue-system/analysis_active.json")
 	ap.add_argument("--dup", type=float, default=0.80)
 	ap.add_argument("--ovl", type=float, default=0.55)
+	ap.add_argument("--approx", action="store_true", help="Without numpy, prune phase pairs by SimHash distance before exact cosine (may miss borderline pairs); ignored when numpy is installed")
+	ap.add_argument("--no-cache", action="store_true", help="Do not read or write the phase summary cache (.cache/analysis_advanced_check/summaries.sqlite next to --file, created by default)")
 	args = ap.parse_args()
 
 	data = load_json(args.file)
@@ -111,11 +318,12 @@ def main():
 	task = data[0]
 	todos = task.get("todos", [])
 
-	phases = [phase_summary(td) for td in todos]
+	cache_path = None if args.no_cache else Path(args.file).parent / ".cache" / "analysis_advanced_check" / "summaries.sqlite"
+	phases = summarize_phases(todos, cache_path)
 	phase_status = [(p["phase"],) + status_for_phase(p) for p in phases]
 
 	# Cross-phase signals
-	pairwise = cross_phase_similarity(phases, dup_threshold=args.dup, overlap_threshold=args.ovl)
+	pairwise = cross_phase_similarity(phases, dup_threshold=args.dup, overlap_threshold=args.ovl, approx=args.approx)
 	collisions = concern_collisions(phases)
 
 	# Print STRICT ANALYSIS SUMMARY
@@ -9,9 +9,11 @@ Purpose
 
 Key features
   - Auto-detects repository root (walks upward for memory-bank/queue-system/tasks_active.json;
-    falls back to git top-level; then CWD)
+    falls back to the nearest .git top-level; then CWD)
   - Defaults tasks file to <repo_root>/memory-bank/queue-system/tasks_active.json
   - Proactive mode performs repo-wide audits (CI policies, port collisions, global Dockerfile policies)
+  - Token bags are cached in <repo_root>/.cache/analyzer/tokens.sqlite keyed by (path, mtime, size);
+    unchanged files are not re-tokenized on later runs (--no-token-cache disables)
 
 CLI
   python3 analyzer.py --phase-index K [--proactive]
@@ -37,14 +39,36 @@ Output JSON schema
 from __future__ import annotations
 
 import argparse
+import bisect
 import json
+import math
 import os
 import re
+import sqlite3
 import sys
 import subprocess
+from array import array
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+# Optional: batch similarity as one sparse matrix-vector product
+try:
+    import numpy as np
+    from scipy import sparse  # type: ignore[import-untyped]
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+# Optional: faster JSON parsing straight from bytes
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 
 # --------------------------- Filesystem Scanning ---------------------------
@@ -57,6 +81,10 @@ DEFAULT_INCLUDE_EXTENSIONS = {
 
 SPECIAL_FILENAMES = {"Dockerfile", "docker-compose.yml", "Makefile"}
 
+# Larger files are generated artifacts (lockfiles, minified bundles, dumps)
+MAX_SCAN_BYTES = 512 * 1024
+BINARY_PROBE_BYTES = 4096
+
 DEFAULT_EXCLUDE_DIRS = {
     ".git", "node_modules", ".venv", "venv", "__pycache__", ".pytest_cache",
     ".mypy_cache", ".cache", "dist", "build", "outputs", "tmp", ".cursor",
@@ -64,24 +92,165 @@ DEFAULT_EXCLUDE_DIRS = {
 }
 
 
-def should_scan_file(path: Path) -> bool:
-    if path.name in SPECIAL_FILENAMES:
+def _should_scan_name(name: str) -> bool:
+    if name in SPECIAL_FILENAMES:
         return True
-    if path.suffix in DEFAULT_INCLUDE_EXTENSIONS:
+    if os.path.splitext(name)[1] in DEFAULT_INCLUDE_EXTENSIONS:
         return True
-    if path.name.lower().startswith("readme"):
+    if name.lower().startswith("readme"):
         return True
     return False
 
 
+def should_scan_file(path: Path) -> bool:
+    return _should_scan_name(path.name)
+
+
+def _walk_scannable(top: str) -> Iterable[str]:
+    # scandir keeps d_type from readdir, so is_dir/is_file need no extra stat
+    try:
+        with os.scandir(top) as it:
+            entries = list(it)
+    except OSError:
+        return
+    subdirs: List[str] = []
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            if entry.name not in DEFAULT_EXCLUDE_DIRS:
+                subdirs.append(entry.path)
+        elif entry.is_file() and _should_scan_name(entry.name):
+            try:
+                if entry.stat().st_size > MAX_SCAN_BYTES:
+                    continue
+            except OSError:
+                continue
+            yield entry.path
+    for sub in subdirs:
+        yield from _walk_scannable(sub)
+
+
 def iter_repo_files(root: Path) -> Iterable[Path]:
-    for dirpath, dirnames, filenames in os.walk(root):
-        # prune excluded directories in-place for performance
-        dirnames[:] = [d for d in dirnames if d not in DEFAULT_EXCLUDE_DIRS]
-        for name in filenames:
-            p = Path(dirpath) / name
-            if should_scan_file(p):
-                yield p
+    for fp in _walk_scannable(str(root)):
+        yield Path(fp)
+
+
+FileCache = List[Tuple[Path, str]]
+
+
+def read_scannable_text(fp: Path) -> Optional[str]:
+    # None for unreadable or binary-looking (NUL in the first block) files
+    try:
+        with open(fp, "rb") as f:
+            probe = f.read(BINARY_PROBE_BYTES)
+            if b"\x00" in probe:
+                return None
+            data = probe + f.read()
+    except Exception:
+        return None
+    text = data.decode("utf-8", "ignore")
+    if "\r" in text:
+        # match read_text()'s universal-newline translation
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+# --------------------------- Token Cache ----------------------------------
+
+# Bump when normalize()/bow() output changes so stale rows are discarded
+TOKEN_CACHE_VERSION = 2
+
+TokenRow = Tuple[int, int, str]  # (st_mtime_ns, st_size, bow as a JSON object)
+
+
+def _token_cache_path(repo_root: Path) -> Path:
+    return repo_root / ".cache" / "analyzer" / "tokens.sqlite"
+
+
+def _open_token_cache(repo_root: Path) -> Optional[sqlite3.Connection]:
+    try:
+        path = _token_cache_path(repo_root)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(path))
+        if conn.execute("PRAGMA user_version").fetchone()[0] != TOKEN_CACHE_VERSION:
+            conn.execute("DROP TABLE IF EXISTS tokens")
+            conn.execute(f"PRAGMA user_version = {TOKEN_CACHE_VERSION}")
+        conn.execute("CREATE TABLE IF NOT EXISTS tokens (path TEXT PRIMARY KEY, mtime INTEGER, size INTEGER, bow TEXT)")
+        return conn
+    except Exception:
+        return None
+
+
+def _load_token_rows(conn: sqlite3.Connection, paths: List[str]) -> Dict[str, TokenRow]:
+    # rows for the walked paths only; the temp table also tells the write which rows are stale
+    try:
+        conn.execute("CREATE TEMP TABLE walked (path TEXT PRIMARY KEY)")
+        conn.executemany("INSERT OR IGNORE INTO walked (path) VALUES (?)", ((p,) for p in paths))
+        rows = conn.execute("SELECT path, mtime, size, bow FROM tokens JOIN walked USING (path)")
+        return {path: (mtime, size, blob) for path, mtime, size, blob in rows}
+    except Exception:
+        return {}
+
+
+def _decode_bow(raw: object) -> Optional[Counter[str]]:
+    # The cache lives inside the scanned repo, so rows are untrusted: JSON only,
+    # and anything other than a {token: count} object is treated as a miss
+    if not isinstance(raw, str):
+        return None
+    try:
+        data = json.loads(raw)
+    except ValueError:
+        return None
+    if not isinstance(data, dict) or not all(type(v) is int for v in data.values()):
+        return None
+    return Counter(data)
+
+
+def _load_and_tokenize(fp: Path, cached: Dict[str, TokenRow]) -> Optional[Tuple[Path, str, Counter[str], Optional[TokenRow]]]:
+    # returns the fresh cache row as the last element when the bow was recomputed
+    try:
+        st = os.stat(fp)
+    except OSError:
+        return None
+    text = read_scannable_text(fp)
+    if text is None:
+        return None
+    hit = cached.get(str(fp))
+    if hit is not None and hit[0] == st.st_mtime_ns and hit[1] == st.st_size:
+        cached_bow = _decode_bow(hit[2])
+        if cached_bow is not None:
+            return fp, text, cached_bow, None
+    file_bow = bow(text)
+    return fp, text, file_bow, (st.st_mtime_ns, st.st_size, json.dumps(dict(file_bow)))
+
+
+def load_file_cache(root: Path, use_token_cache: bool = True) -> Tuple[FileCache, List[Counter[str]]]:
+    # serial walk, parallel read + tokenize; map() keeps walk order deterministic
+    conn = _open_token_cache(root) if use_token_cache else None
+    files = list(iter_repo_files(root))
+    cached = _load_token_rows(conn, [str(fp) for fp in files]) if conn is not None else {}
+    cache: FileCache = []
+    bows: List[Counter[str]] = []
+    fresh: List[Tuple[str, int, int, str]] = []
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as ex:
+        for loaded in ex.map(lambda fp: _load_and_tokenize(fp, cached), files):
+            if loaded is None:
+                continue
+            fp, text, file_bow, row = loaded
+            cache.append((fp, text))
+            bows.append(file_bow)
+            if row is not None:
+                fresh.append((str(fp),) + row)
+    if conn is not None:
+        try:
+            with conn:
+                # drop rows for files that were deleted, moved, or are now excluded
+                conn.execute("DELETE FROM tokens WHERE path NOT IN (SELECT path FROM walked)")
+                conn.executemany("INSERT OR REPLACE INTO tokens (path, mtime, size, bow) VALUES (?, ?, ?, ?)", fresh)
+        except Exception:
+            pass
+        finally:
+            conn.close()
+    return cache, bows
 
 
 # --------------------------- Repo Root Detection ---------------------------
@@ -97,6 +266,17 @@ def _find_root_with_tasks(start: Path) -> Optional[Path]:
     return None
 
 
+def _find_dotgit(start: Path) -> Optional[Path]:
+    cur = start.resolve()
+    while True:
+        if (cur / ".git").exists():
+            return cur
+        if cur.parent == cur:
+            break
+        cur = cur.parent
+    return None
+
+
 def _detect_repo_root() -> Path:
     # 1) CWD → upwards
     cwd = Path.cwd()
@@ -108,14 +288,22 @@ def _detect_repo_root() -> Path:
     root = _find_root_with_tasks(here)
     if root:
         return root
-    # 3) git top-level
-    try:
-        top = subprocess.check_output(["git", "rev-parse", "--show-toplevel"], stderr=subprocess.DEVNULL).decode().strip()
-        root = _find_root_with_tasks(Path(top))
+    # 3) git top-level: $GIT_TOP when CI provides it, else a plain .git directory walk
+    top_env = os.environ.get("GIT_TOP")
+    top = Path(top_env) if top_env else _find_dotgit(cwd)
+    if top is not None and (top_env or (top / ".git").is_dir()):
+        root = _find_root_with_tasks(top)
         if root:
             return root
-    except Exception:
-        pass
+    elif top is not None:
+        # .git is a file (worktree/submodule): let git resolve the real top-level
+        try:
+            out = subprocess.check_output(["git", "rev-parse", "--show-toplevel"], stderr=subprocess.DEVNULL).decode().strip()
+            root = _find_root_with_tasks(Path(out))
+            if root:
+                return root
+        except Exception:
+            pass
     # 4) fallback to cwd
     return cwd
 
@@ -124,43 +312,154 @@ def _detect_repo_root() -> Path:
 
 WORD_RE = re.compile(r"[A-Za-z0-9_./:-]{2,}")
 
+STOP_WORDS = frozenset({
+    "the", "and", "for", "with", "that", "this", "are", "not", "only", "but",
+    "also", "when", "from", "into", "your", "their", "have", "has", "had",
+    "will", "shall", "must", "should", "could", "would", "can", "may", "like",
+    "then", "else", "elif", "true", "false", "none",
+})
+
+
+def _keep_token(t: str) -> bool:
+    return len(t) >= 3 and t not in STOP_WORDS
+
 
 def normalize(text: str) -> List[str]:
-    tokens = [t.lower() for t in WORD_RE.findall(text or "")]
-    stop = {
-        "the", "and", "for", "with", "that", "this", "are", "not", "only", "but",
-        "also", "when", "from", "into", "your", "their", "have", "has", "had",
-        "will", "shall", "must", "should", "could", "would", "can", "may", "like",
-        "then", "else", "elif", "true", "false", "none",
-    }
-    return [t for t in tokens if t not in stop and len(t) >= 3]
+    return [t for t in map(str.lower, WORD_RE.findall(text or "")) if _keep_token(t)]
 
 
-def bow(text: str) -> Dict[str, int]:
-    counts: Dict[str, int] = {}
-    for tok in normalize(text):
-        counts[tok] = counts.get(tok, 0) + 1
+def bow(text: str) -> Counter[str]:
+    # Count every token in one C-level pass, then filter the (much smaller) vocabulary
+    counts = Counter(map(str.lower, WORD_RE.findall(text or "")))
+    for tok in [t for t in counts if not _keep_token(t)]:
+        del counts[tok]
     return counts
 
 
-def cosine(a: Dict[str, int], b: Dict[str, int]) -> float:
-    if not a or not b:
+def vector_norm(v: Mapping[str, int]) -> float:
+    return math.sqrt(sum(c * c for c in v.values()))
+
+
+def _cosine_fast(phase_bow: Dict[str, int], phase_norm: float, file_bow: Dict[str, int]) -> float:
+    # phase_norm is precomputed by the caller, only the file side is summed here
+    if not phase_bow or not file_bow or phase_norm == 0:
+        return 0.0
+    # sparse dot product: only keys present in both vectors contribute
+    small, large = (phase_bow, file_bow) if len(phase_bow) < len(file_bow) else (file_bow, phase_bow)
+    num = sum(v * large[k] for k, v in small.items() if k in large)
+    if num == 0:
         return 0.0
-    keys = set(a) | set(b)
-    num = sum(a.get(k, 0) * b.get(k, 0) for k in keys)
-    da = sum(v * v for v in a.values()) ** 0.5
-    db = sum(v * v for v in b.values()) ** 0.5
-    return 0.0 if da == 0 or db == 0 else float(num) / float(da * db)
+    file_norm = vector_norm(file_bow)
+    return 0.0 if file_norm == 0 else float(num) / float(phase_norm * file_norm)
+
+
+def cosine(a: Dict[str, int], b: Dict[str, int]) -> float:
+    return _cosine_fast(a, vector_norm(a), b)
+
+
+def similar_rows(query: Mapping[str, int], rows: Sequence[Mapping[str, int]], threshold: float) -> List[Tuple[int, float]]:
+    """Return (row index, cosine) for every row whose similarity to query is >= threshold."""
+    query_norm = vector_norm(query)
+    if not query or query_norm == 0:
+        return []
+    if not SCIPY_AVAILABLE:
+        # Cauchy-Schwarz: cos(q, r) <= |q restricted to shared keys| / |q|, so rows whose
+        # shared vocabulary cannot reach the threshold are rejected before any row norm
+        bound = threshold * query_norm * (1.0 - 1e-9)
+        query_keys = query.keys()
+        out: List[Tuple[int, float]] = []
+        for i, row in enumerate(rows):
+            hit_keys = query_keys & row.keys()
+            if not hit_keys or math.sqrt(sum(query[k] * query[k] for k in hit_keys)) < bound:
+                continue
+            num = sum(query[k] * row[k] for k in hit_keys)
+            sim = float(num) / float(query_norm * vector_norm(row))
+            if sim >= threshold:
+                out.append((i, sim))
+        return out
+
+    # rows -> CSR matrix (N_rows x V) stored as compact SoA arrays: int32 column
+    # ids + uint16 counts (uint32 only if some count overflows); float32 only at the dot
+    vocab: Dict[str, int] = {}
+    indptr = array("i", [0])
+    indices = array("i")
+    data = array("I")
+    for row in rows:
+        indices.extend(vocab.setdefault(tok, len(vocab)) for tok in row)
+        data.extend(row.values())
+        indptr.append(len(indices))
+    if not vocab:
+        return []
+    counts = np.frombuffer(data, dtype=np.uint32)
+    if counts.max() <= np.iinfo(np.uint16).max:
+        counts = counts.astype(np.uint16)
+    indptr_np = np.frombuffer(indptr, dtype=np.int32)
+    m = sparse.csr_matrix((counts, np.frombuffer(indices, dtype=np.int32), indptr_np), shape=(len(rows), len(vocab)))
+    q = np.zeros(len(vocab), dtype=np.float32)
+    for tok, cnt in query.items():
+        col = vocab.get(tok)
+        if col is not None:
+            q[col] = cnt
+    row_ids = np.repeat(np.arange(len(rows)), np.diff(indptr_np))
+    row_norms = np.sqrt(np.bincount(row_ids, weights=np.square(counts, dtype=np.float32), minlength=len(rows))).astype(np.float32)
+    dots = m @ q
+    sims = np.divide(dots, row_norms * np.float32(query_norm), out=np.zeros_like(dots), where=row_norms > 0)
+    return [(int(i), float(sims[i])) for i in np.nonzero(sims >= threshold)[0]]
+
+
+_RE_NEWLINE = re.compile(r"\n")
+
+
+@lru_cache(maxsize=64)
+def _newline_positions(text: str) -> List[int]:
+    return [m.start() for m in _RE_NEWLINE.finditer(text)]
 
 
 def lines_with_regex(text: str, pattern: re.Pattern[str]) -> List[Tuple[int, str]]:
+    # Search the whole text and map hits to lines, so hit-free files cost one scan.
+    # Anchored patterns must use re.M for ^/$ to see line boundaries here.
     out: List[Tuple[int, str]] = []
-    for i, line in enumerate(text.splitlines(), start=1):
+    newlines: Optional[List[int]] = None
+    pos, end = 0, len(text)
+    while pos < end:
+        m = pattern.search(text, pos)
+        if m is None:
+            break
+        if newlines is None:
+            newlines = _newline_positions(text)
+        idx = bisect.bisect_right(newlines, m.start())
+        line_start = newlines[idx - 1] + 1 if idx else 0
+        line_end = newlines[idx] if idx < len(newlines) else end
+        line = text[line_start:line_end]
+        # a match may run across "\n" (e.g. via \s); only report lines that match alone
         if pattern.search(line):
-            out.append((i, line.rstrip()))
+            out.append((idx + 1, line.rstrip()))
+        pos = line_end + 1
     return out
 
 
+def _lower_ascii(text: str) -> Optional[str]:
+    # str.lower() agrees with re.I only on ASCII text (re.I also folds e.g. U+212A to "k")
+    return text.lower() if text.isascii() else None
+
+
+def contains_any_literal(text: str, literals: Tuple[str, ...], pattern: re.Pattern[str]) -> bool:
+    """True if text contains one of the lowercase literals (case-insensitive).
+
+    pattern must be the equivalent re.I alternation; it is only used for non-ASCII text.
+    """
+    low = _lower_ascii(text)
+    if low is None:
+        return pattern.search(text) is not None
+    return any(lit in low for lit in literals)
+
+
+def may_contain_literal(text: str, literals: Tuple[str, ...]) -> bool:
+    # cheap necessary condition before running a regex whose every match contains a literal
+    low = _lower_ascii(text)
+    return low is None or any(lit in low for lit in literals)
+
+
 # --------------------------- Findings Schema ------------------------------
 
 @dataclass
@@ -186,84 +485,173 @@ class Finding:
         }
 
 
+# --------------------------- Detector Patterns ----------------------------
+
+POLICY_MARKERS = {
+    "non_root": re.compile(r"non[- ]root|uid:gid|user\s+10001", re.I),
+    "tini": re.compile(r"\btini\b", re.I),
+    "ghcr": re.compile(r"ghcr\.io", re.I),
+    "cuda": re.compile(r"cuda\s*12\.1|cu121|TORCH_CUDA_ARCH_LIST", re.I),
+    "trivy": re.compile(r"\btrivy\b", re.I),
+    "sbom": re.compile(r"sbom|spdx|syft", re.I),
+    "health": re.compile(r"/health", re.I),
+    "observability": re.compile(r"UnifiedObservabilityCenter|observability", re.I),
+}
+
+BLIND_SPOT_MARKERS = {
+    "health_endpoint": re.compile(r"/health", re.I),
+    "rollback_prev_tag": re.compile(r"\bprev\b|FORCE_IMAGE_TAG", re.I),
+    "observability_payload": re.compile(r"UnifiedObservabilityCenter|SBOM\s+digest|git\s+SHA", re.I),
+}
+
+# Both marker sets split into atoms for a single repo scan. Where one atom's match
+# can contain another's ("SBOM digest" / "sbom"), the longer atom comes first and
+# the markers below list both, so non-overlapping finditer still sees every marker.
+# Policy markers were matched line by line, so their atoms must not cross a line
+# break; blind-spot markers were searched over whole files and keep \s.
+_INLINE_WS = r"[^\S\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029]"
+MARKER_ATOMS = {
+    "non_root": rf"non[- ]root|uid:gid|user{_INLINE_WS}+10001",
+    "tini": r"\btini\b",
+    "ghcr": r"ghcr\.io",
+    "cuda": rf"cuda{_INLINE_WS}*12\.1|cu121|TORCH_CUDA_ARCH_LIST",
+    "trivy": r"\btrivy\b",
+    "sbom_digest": r"SBOM\s+digest",
+    "sbom": r"sbom|spdx|syft",
+    "health": r"/health",
+    "unified_observability": r"UnifiedObservabilityCenter",
+    "observability": r"observability",
+    "prev_tag": r"\bprev\b|FORCE_IMAGE_TAG",
+    "git_sha": r"git\s+SHA",
+}
+
+POLICY_MARKER_ATOMS = {
+    "non_root": {"non_root"},
+    "tini": {"tini"},
+    "ghcr": {"ghcr"},
+    "cuda": {"cuda"},
+    "trivy": {"trivy"},
+    "sbom": {"sbom", "sbom_digest"},
+    "health": {"health"},
+    "observability": {"observability", "unified_observability"},
+}
+
+BLIND_SPOT_MARKER_ATOMS = {
+    "health_endpoint": {"health"},
+    "rollback_prev_tag": {"prev_tag"},
+    "observability_payload": {"unified_observability", "sbom_digest", "git_sha"},
+}
+
+_MARKER_UNION = re.compile("|".join(f"(?P<{n}>{p})" for n, p in MARKER_ATOMS.items()), re.I)
+
+_RE_USER_10001 = re.compile(r"^\s*USER\s+10001(?::10001)?\b", re.I | re.M)
+_RE_TINI_ENTRY = re.compile(r"ENTRYPOINT\s+\[.*tini.*\]|tini\s+--", re.I)
+_RE_CUDA = POLICY_MARKERS["cuda"]
+_RE_BASH_FENCE = re.compile(r"```(?:bash|sh)?\n([\s\S]*?)\n```", re.I | re.M)
+_RE_APT_INSTALL = re.compile(r"apt(?:-get)?\s+install\s+(.+)$", re.I)
+_RE_PIP_INSTALL = re.compile(r"pip\s+install\s+(.+)$", re.I)
+_RE_APT_GET_INSTALL = re.compile(r"apt[- ]get\s+install\s+-y?\s+([^\n]+)", re.I)
+_RE_PKG_TOKEN = re.compile(r"^[A-Za-z0-9_.+-]{2,}$")
+_RE_REQ_SPEC_SPLIT = re.compile(r"[<>=\[]")
+_RE_WHITESPACE = re.compile(r"\s+")
+
+_RE_CI_EXPECTS_TRIVY = re.compile(r"trivy|HIGH/CRITICAL|severity", re.I)
+_RE_CI_EXPECTS_SBOM = re.compile(r"sbom|spdx|syft", re.I)
+_RE_CI_EXPECTS_TAGS = re.compile(r"ghcr\.io|YYYYMMDD-<git_sha>", re.I)
+_RE_CI_TRIVY = re.compile(r"trivy|aquasecurity/trivy-action|severity|exit-code", re.I)
+_RE_CI_SBOM = re.compile(r"syft|sbom|spdx|anchore/sbom-action", re.I)
+_RE_CI_GHCR = re.compile(r"ghcr\.io", re.I)
+_RE_CI_TAGS = re.compile(r"ghcr\.io|\bYYYYMMDD-[0-9a-f]{7,}\b", re.I)
+
+_RE_COMPOSE_SERVICE = re.compile(r"^[A-Za-z0-9_.-]+:\s*$")
+_RE_COMPOSE_PORT = re.compile(r"-\s*\"?(\d{2,5}):\d{2,5}\"?")
+_RE_MATCH_NOTHING = re.compile(r"^$")
+
+
 # --------------------------- Detectors ------------------------------------
 
-def detect_semantic_duplicates(phase_text: str, repo_root: Path) -> List[Finding]:
+MarkerHits = Dict[str, List[Evidence]]
+
+
+def scan_markers(text: str, pattern: re.Pattern[str] = _MARKER_UNION) -> Dict[str, List[Tuple[int, str]]]:
+    # One finditer pass; hits keyed by the named group that matched
+    out: Dict[str, List[Tuple[int, str]]] = {}
+    newlines: Optional[List[int]] = None
+    for m in pattern.finditer(text):
+        if newlines is None:
+            newlines = _newline_positions(text)
+        idx = bisect.bisect_right(newlines, m.start())
+        line_start = newlines[idx - 1] + 1 if idx else 0
+        line_end = newlines[idx] if idx < len(newlines) else len(text)
+        hits = out.setdefault(m.lastgroup, [])  # type: ignore[arg-type]
+        if not hits or hits[-1][0] != idx + 1:
+            hits.append((idx + 1, text[line_start:line_end].rstrip()))
+    return out
+
+
+def scan_repo_markers(file_cache: FileCache) -> MarkerHits:
+    merged: MarkerHits = {}
+    for p, txt in file_cache:
+        for atom, hits in scan_markers(txt).items():
+            merged.setdefault(atom, []).extend(Evidence(str(p), ln, sn[:200]) for ln, sn in hits)
+    return merged
+
+
+def _phase_references_markers(phase_text: str) -> bool:
+    return any(p.search(phase_text) for p in (*POLICY_MARKERS.values(), *BLIND_SPOT_MARKERS.values()))
+
+
+def detect_semantic_duplicates(phase_text: str, file_cache: FileCache, file_bows: Optional[List[Counter[str]]] = None) -> List[Finding]:
     findings: List[Finding] = []
     phase_bow = bow(phase_text)
     threshold = 0.78
-    for fp in iter_repo_files(repo_root):
-        try:
-            text = fp.read_text(encoding="utf-8", errors="ignore")
-        except Exception:
-            continue
-        file_bow = bow(text)
-        sim = cosine(phase_bow, file_bow)
-        if sim >= threshold:
-            keywords = sorted(phase_bow, key=lambda k: phase_bow[k], reverse=True)[:6]
-            pattern = re.compile(r"|".join(re.escape(k) for k in keywords if k), re.I) if keywords else re.compile(r"^$")
-            ev_lines = lines_with_regex(text, pattern)[:5]
-            if ev_lines:
-                evidence = [Evidence(path=str(fp), line=ln, snippet=snip[:200]) for ln, snip in ev_lines]
-            else:
-                evidence = [Evidence(path=str(fp), line=1, snippet=(text[:200] if text else ""))]
-            findings.append(Finding(
-                category="duplicate",
-                severity="MEDIUM",
-                description=f"Repository file appears semantically similar to this phase (cosine={sim:.2f}).",
-                evidence=evidence,
-            ))
+    keywords = sorted(phase_bow, key=lambda k: phase_bow[k], reverse=True)[:6]
+    pattern = re.compile(r"|".join(re.escape(k) for k in keywords if k), re.I) if keywords else _RE_MATCH_NOTHING
+    if file_bows is None:
+        file_bows = [bow(text) for _, text in file_cache]
+    for idx, sim in similar_rows(phase_bow, file_bows, threshold):
+        fp, text = file_cache[idx]
+        ev_lines = lines_with_regex(text, pattern)[:5]
+        if ev_lines:
+            evidence = [Evidence(path=str(fp), line=ln, snippet=snip[:200]) for ln, snip in ev_lines]
+        else:
+            evidence = [Evidence(path=str(fp), line=1, snippet=(text[:200] if text else ""))]
+        findings.append(Finding(
+            category="duplicate",
+            severity="MEDIUM",
+            description=f"Repository file appears semantically similar to this phase (cosine={sim:.2f}).",
+            evidence=evidence,
+        ))
     return findings
 
 
-def detect_architectural_conflicts(phase_text: str, repo_root: Path) -> List[Finding]:
+def detect_architectural_conflicts(phase_text: str, file_cache: FileCache, marker_hits: Optional[MarkerHits] = None) -> List[Finding]:
     findings: List[Finding] = []
 
-    policy_markers = {
-        "non_root": re.compile(r"non[- ]root|uid:gid|user\s+10001", re.I),
-        "tini": re.compile(r"\btini\b", re.I),
-        "ghcr": re.compile(r"ghcr\.io", re.I),
-        "cuda": re.compile(r"cuda\s*12\.1|cu121|TORCH_CUDA_ARCH_LIST", re.I),
-        "trivy": re.compile(r"\btrivy\b", re.I),
-        "sbom": re.compile(r"sbom|spdx|syft", re.I),
-        "health": re.compile(r"/health", re.I),
-        "observability": re.compile(r"UnifiedObservabilityCenter|observability", re.I),
-    }
+    expected = [name for name, marker in POLICY_MARKERS.items() if marker.search(phase_text)]
+    if expected and marker_hits is None:
+        marker_hits = scan_repo_markers(file_cache)
 
-    file_cache: List[Tuple[Path, str]] = []
-    for fp in iter_repo_files(repo_root):
-        try:
-            text = fp.read_text(encoding="utf-8", errors="ignore")
-        except Exception:
-            continue
-        file_cache.append((fp, text))
-
-    def repo_has(pattern: re.Pattern[str]) -> List[Tuple[Path, int, str]]:
-        hits: List[Tuple[Path, int, str]] = []
-        for p, txt in file_cache:
-            for ln, sn in lines_with_regex(txt, pattern):
-                hits.append((p, ln, sn))
-        return hits
-
-    for name, marker in policy_markers.items():
-        if marker.search(phase_text):
-            hits = repo_has(marker)
-            if not hits:
-                findings.append(Finding(
-                    category="misalignment",
-                    severity="MEDIUM",
-                    description=f"Phase references '{name}' policy/feature but repository shows no evidence of it.",
-                    evidence=[],
-                ))
+    for name in expected:
+        if not any(marker_hits.get(atom) for atom in POLICY_MARKER_ATOMS[name]):  # type: ignore[union-attr]
+            findings.append(Finding(
+                category="misalignment",
+                severity="MEDIUM",
+                description=f"Phase references '{name}' policy/feature but repository shows no evidence of it.",
+                evidence=[],
+            ))
 
-    dockerfiles = [p for p, _ in file_cache if p.name == "Dockerfile"]
-    docker_texts = {p: (p.read_text(encoding="utf-8", errors="ignore") if p.exists() else "") for p in dockerfiles}
+    # Reuse the cached texts; anything in file_cache was already readable
+    docker_texts = {p: txt for p, txt in file_cache if p.name == "Dockerfile"}
+    dockerfiles = list(docker_texts)
 
-    expects_non_root = re.search(r"non[- ]root|uid:gid|user\s+10001", phase_text, re.I) is not None
+    expects_non_root = POLICY_MARKERS["non_root"].search(phase_text) is not None
     if expects_non_root and dockerfiles:
         nonroot_evidence: List[Evidence] = []
         for p, txt in docker_texts.items():
-            for ln, sn in lines_with_regex(txt, re.compile(r"^\s*USER\s+10001(?::10001)?\b", re.I)):
+            if "10001" not in txt:
+                continue
+            for ln, sn in lines_with_regex(txt, _RE_USER_10001):
                 nonroot_evidence.append(Evidence(str(p), ln, sn))
         if not nonroot_evidence:
             findings.append(Finding(
@@ -273,12 +661,13 @@ def detect_architectural_conflicts(phase_text: str, repo_root: Path) -> List[Fin
                 evidence=[],
             ))
 
-    expects_tini = re.search(r"\btini\b", phase_text, re.I) is not None
+    expects_tini = POLICY_MARKERS["tini"].search(phase_text) is not None
     if expects_tini and dockerfiles:
         tini_ev: List[Evidence] = []
-        pattern_entry = re.compile(r"ENTRYPOINT\s+\[.*tini.*\]|tini\s+--", re.I)
         for p, txt in docker_texts.items():
-            for ln, sn in lines_with_regex(txt, pattern_entry):
+            if not may_contain_literal(txt, ("tini",)):
+                continue
+            for ln, sn in lines_with_regex(txt, _RE_TINI_ENTRY):
                 tini_ev.append(Evidence(str(p), ln, sn))
         if not tini_ev:
             findings.append(Finding(
@@ -288,11 +677,13 @@ def detect_architectural_conflicts(phase_text: str, repo_root: Path) -> List[Fin
                 evidence=[],
             ))
 
-    expects_cuda = re.search(r"cuda\s*12\.1|cu121|TORCH_CUDA_ARCH_LIST", phase_text, re.I) is not None
+    expects_cuda = _RE_CUDA.search(phase_text) is not None
     if expects_cuda and dockerfiles:
         cuda_ev: List[Evidence] = []
         for p, txt in docker_texts.items():
-            for ln, sn in lines_with_regex(txt, re.compile(r"cuda\s*12\.1|cu121|TORCH_CUDA_ARCH_LIST", re.I)):
+            if not may_contain_literal(txt, ("cuda", "cu121")):
+                continue
+            for ln, sn in lines_with_regex(txt, _RE_CUDA):
                 cuda_ev.append(Evidence(str(p), ln, sn))
         if not cuda_ev:
             findings.append(Finding(
@@ -307,54 +698,45 @@ def detect_architectural_conflicts(phase_text: str, repo_root: Path) -> List[Fin
 
 def _extract_bash_code_blocks(text: str) -> List[str]:
     blocks: List[str] = []
-    fence = re.compile(r"```(?:bash|sh)?\n([\s\S]*?)\n```", re.I | re.M)
-    for m in fence.finditer(text or ""):
+    for m in _RE_BASH_FENCE.finditer(text or ""):
         blocks.append(m.group(1))
     return blocks
 
 
-def detect_missing_dependencies(phase_text: str, repo_root: Path) -> List[Finding]:
+def detect_missing_dependencies(phase_text: str, file_cache: FileCache, requirements_cache: FileCache) -> List[Finding]:
     findings: List[Finding] = []
 
     # Extract apt/pip installs ONLY from fenced bash/sh code blocks
     req_tokens: List[str] = []
     for block in _extract_bash_code_blocks(phase_text):
         for line in block.splitlines():
-            m_apt = re.search(r"apt(?:-get)?\s+install\s+(.+)$", line.strip(), flags=re.I)
+            m_apt = _RE_APT_INSTALL.search(line.strip())
             if m_apt:
-                pkgs = [p for p in re.split(r"\s+", m_apt.group(1)) if p and not p.startswith("-")]
+                pkgs = [p for p in _RE_WHITESPACE.split(m_apt.group(1)) if p and not p.startswith("-")]
                 req_tokens.extend(pkgs)
-            m_pip = re.search(r"pip\s+install\s+(.+)$", line.strip(), flags=re.I)
+            m_pip = _RE_PIP_INSTALL.search(line.strip())
             if m_pip:
                 if "-r" in line or "--requirement" in line:
                     continue
-                pkgs = [p for p in re.split(r"\s+", m_pip.group(1)) if p and not p.startswith("-")]
+                pkgs = [p for p in _RE_WHITESPACE.split(m_pip.group(1)) if p and not p.startswith("-")]
                 req_tokens.extend(pkgs)
 
-    req_tokens = [t for t in req_tokens if re.match(r"^[A-Za-z0-9_.+-]{2,}$", t)]
+    req_tokens = [t for t in req_tokens if _RE_PKG_TOKEN.match(t)]
     req_tokens = list(dict.fromkeys(req_tokens))[:40]
 
-    requirements_files = [p for p in iter_repo_files(repo_root) if p.name.lower().startswith("requirements")]
     pip_known: set[str] = set()
-    for rf in requirements_files:
-        try:
-            for line in rf.read_text(encoding="utf-8", errors="ignore").splitlines():
-                if line.strip() and not line.strip().startswith("#"):
-                    pkg = re.split(r"[<>=\[]", line.strip())[0]
-                    if pkg:
-                        pip_known.add(pkg.lower())
-        except Exception:
-            pass
+    for _, text in requirements_cache:
+        for line in text.splitlines():
+            if line.strip() and not line.strip().startswith("#"):
+                pkg = _RE_REQ_SPEC_SPLIT.split(line.strip())[0]
+                if pkg:
+                    pip_known.add(pkg.lower())
 
     apt_known: set[str] = set()
-    for p in iter_repo_files(repo_root):
+    for p, text in file_cache:
         if p.name == "Dockerfile" or p.suffix in {".sh", ".bash"}:
-            try:
-                text = p.read_text(encoding="utf-8", errors="ignore")
-            except Exception:
-                continue
-            for m in re.finditer(r"apt[- ]get\s+install\s+-y?\s+([^\n]+)", text, flags=re.I):
-                pkgs = re.split(r"\s+", m.group(1).strip())
+            for m in _RE_APT_GET_INSTALL.finditer(text):
+                pkgs = _RE_WHITESPACE.split(m.group(1).strip())
                 for pkg in pkgs:
                     if pkg and not pkg.startswith("-"):
                         apt_known.add(pkg.lower())
@@ -374,30 +756,15 @@ def detect_missing_dependencies(phase_text: str, repo_root: Path) -> List[Findin
     return findings
 
 
-def detect_blind_spots(phase_text: str, repo_root: Path) -> List[Finding]:
+def detect_blind_spots(phase_text: str, file_cache: FileCache, marker_hits: Optional[MarkerHits] = None) -> List[Finding]:
     findings: List[Finding] = []
-    patterns = {
-        "health_endpoint": re.compile(r"/health", re.I),
-        "rollback_prev_tag": re.compile(r"\bprev\b|FORCE_IMAGE_TAG", re.I),
-        "observability_payload": re.compile(r"UnifiedObservabilityCenter|SBOM\s+digest|git\s+SHA", re.I),
-    }
 
-    file_cache: List[Tuple[Path, str]] = []
-    for fp in iter_repo_files(repo_root):
-        try:
-            text = fp.read_text(encoding="utf-8", errors="ignore")
-        except Exception:
-            continue
-        file_cache.append((fp, text))
+    expected = [label for label, pat in BLIND_SPOT_MARKERS.items() if pat.search(phase_text)]
+    if expected and marker_hits is None:
+        marker_hits = scan_repo_markers(file_cache)
 
-    def repo_has(pattern: re.Pattern[str]) -> bool:
-        for _, txt in file_cache:
-            if pattern.search(txt):
-                return True
-        return False
-
-    for label, pat in patterns.items():
-        if pat.search(phase_text) and not repo_has(pat):
+    for label in expected:
+        if not any(marker_hits.get(atom) for atom in BLIND_SPOT_MARKER_ATOMS[label]):  # type: ignore[union-attr]
             findings.append(Finding(
                 category="blind_spot",
                 severity="MEDIUM",
@@ -408,30 +775,26 @@ def detect_blind_spots(phase_text: str, repo_root: Path) -> List[Finding]:
     return findings
 
 
-def detect_ci_policy_gaps(phase_text: str, repo_root: Path) -> List[Finding]:
+def detect_ci_policy_gaps(phase_text: str, repo_root: Path, file_cache: FileCache) -> List[Finding]:
     findings: List[Finding] = []
     workflows_dir = repo_root / ".github" / "workflows"
-    expects_trivy = re.search(r"trivy|HIGH/CRITICAL|severity", phase_text, re.I) is not None
-    expects_sbom = re.search(r"sbom|spdx|syft", phase_text, re.I) is not None
-    expects_tags = re.search(r"ghcr\.io|YYYYMMDD-<git_sha>", phase_text, re.I) is not None
+    expects_trivy = _RE_CI_EXPECTS_TRIVY.search(phase_text) is not None
+    expects_sbom = _RE_CI_EXPECTS_SBOM.search(phase_text) is not None
+    expects_tags = _RE_CI_EXPECTS_TAGS.search(phase_text) is not None
 
     if workflows_dir.exists():
-        texts: List[Tuple[Path, str]] = []
-        for fp in workflows_dir.glob("**/*"):
-            if fp.is_file() and fp.suffix in {".yml", ".yaml"}:
-                try:
-                    texts.append((fp, fp.read_text(encoding="utf-8", errors="ignore")))
-                except Exception:
-                    pass
+        texts = [(p, t) for p, t in file_cache if p.suffix in {".yml", ".yaml"} and workflows_dir in p.parents]
         def any_match(pat: re.Pattern[str]) -> List[Evidence]:
             ev: List[Evidence] = []
             for p, t in texts:
                 for ln, sn in lines_with_regex(t, pat):
                     ev.append(Evidence(str(p), ln, sn[:200]))
             return ev
+        def any_literal(literals: Tuple[str, ...], pat: re.Pattern[str]) -> bool:
+            return any(contains_any_literal(t, literals, pat) for _, t in texts)
         if expects_trivy:
-            ev = any_match(re.compile(r"trivy|aquasecurity/trivy-action|severity|exit-code", re.I))
-            if not ev:
+            # "aquasecurity/trivy-action" contains "trivy"
+            if not any_literal(("trivy", "severity", "exit-code"), _RE_CI_TRIVY):
                 findings.append(Finding(
                     category="misalignment",
                     severity="MEDIUM",
@@ -439,8 +802,8 @@ def detect_ci_policy_gaps(phase_text: str, repo_root: Path) -> List[Finding]:
                     evidence=[],
                 ))
         if expects_sbom:
-            ev = any_match(re.compile(r"syft|sbom|spdx|anchore/sbom-action", re.I))
-            if not ev:
+            # "anchore/sbom-action" contains "sbom"
+            if not any_literal(("syft", "sbom", "spdx"), _RE_CI_SBOM):
                 findings.append(Finding(
                     category="misalignment",
                     severity="MEDIUM",
@@ -448,8 +811,7 @@ def detect_ci_policy_gaps(phase_text: str, repo_root: Path) -> List[Finding]:
                     evidence=[],
                 ))
         if expects_tags:
-            ev = any_match(re.compile(r"ghcr\.io|\bYYYYMMDD-[0-9a-f]{7,}\b", re.I))
-            if not ev:
+            if not any_literal(("ghcr.io",), _RE_CI_GHCR) and not any_match(_RE_CI_TAGS):
                 findings.append(Finding(
                     category="misalignment",
                     severity="LOW",
@@ -479,9 +841,9 @@ def detect_port_collisions(repo_root: Path) -> List[Finding]:
     host_ports: Dict[str, List[int]] = {}
     current_service: Optional[str] = None
     for line in text.splitlines():
-        if re.match(r"^[A-Za-z0-9_.-]+:\s*$", line.strip()):
+        if _RE_COMPOSE_SERVICE.match(line.strip()):
             current_service = line.strip().split(":")[0]
-        m = re.search(r"-\s*\"?(\d{2,5}):\d{2,5}\"?", line)
+        m = _RE_COMPOSE_PORT.search(line)
         if m:
             port = int(m.group(1))
             host_ports.setdefault(str(port), []).append(port)
@@ -496,19 +858,14 @@ def detect_port_collisions(repo_root: Path) -> List[Finding]:
     return findings
 
 
-def detect_global_docker_policies(repo_root: Path, require_nonroot: bool, require_tini: bool) -> List[Finding]:
+def detect_global_docker_policies(dockerfiles_cache: FileCache, require_nonroot: bool, require_tini: bool) -> List[Finding]:
     findings: List[Finding] = []
-    dockerfiles = list(p for p in iter_repo_files(repo_root) if p.name == "Dockerfile")
-    if not dockerfiles:
+    if not dockerfiles_cache:
         return findings
     if require_nonroot:
         offenders: List[str] = []
-        for p in dockerfiles:
-            try:
-                txt = p.read_text(encoding="utf-8", errors="ignore")
-            except Exception:
-                continue
-            if not re.search(r"^\s*USER\s+10001(?::10001)?\b", txt, re.I | re.M):
+        for p, txt in dockerfiles_cache:
+            if "10001" not in txt or not _RE_USER_10001.search(txt):
                 offenders.append(str(p))
         if offenders:
             findings.append(Finding(
@@ -519,12 +876,8 @@ def detect_global_docker_policies(repo_root: Path, require_nonroot: bool, requir
             ))
     if require_tini:
         offenders: List[str] = []
-        for p in dockerfiles:
-            try:
-                txt = p.read_text(encoding="utf-8", errors="ignore")
-            except Exception:
-                continue
-            if not re.search(r"ENTRYPOINT\s+\[.*tini.*\]|tini\s+--", txt, re.I):
+        for p, txt in dockerfiles_cache:
+            if not may_contain_literal(txt, ("tini",)) or not _RE_TINI_ENTRY.search(txt):
                 offenders.append(str(p))
         if offenders:
             findings.append(Finding(
@@ -536,45 +889,41 @@ def detect_global_docker_policies(repo_root: Path, require_nonroot: bool, requir
     return findings
 
 
-def analyze_phase(tasks: List[Dict[str, object]], phase_index: int, repo_root: Path, proactive: bool = False) -> Dict[str, object]:
+def analyze_phase(tasks: List[Dict[str, object]], phase_index: int, repo_root: Path, proactive: bool = False, use_token_cache: bool = True) -> Dict[str, object]:
     title, text = get_phase_text(tasks, phase_index)
     findings: List[Finding] = []
 
-    # Detectors (phase-scoped)
-    try:
-        findings.extend(detect_semantic_duplicates(text, repo_root))
-    except Exception:
-        pass
-    try:
-        findings.extend(detect_architectural_conflicts(text, repo_root))
-    except Exception:
-        pass
-    try:
-        findings.extend(detect_missing_dependencies(text, repo_root))
-    except Exception:
-        pass
-    try:
-        findings.extend(detect_blind_spots(text, repo_root))
-    except Exception:
-        pass
-
-    # Proactive repo-wide audits (policy/ports/CI) when enabled
+    # Walk + read the repository once; every detector works off these caches
+    file_cache, file_bows = load_file_cache(repo_root, use_token_cache=use_token_cache)
+    dockerfiles_cache = [(p, t) for p, t in file_cache if p.name == "Dockerfile"]
+    requirements_cache = [(p, t) for p, t in file_cache if p.name.lower().startswith("requirements")]
+    # Policy and blind-spot markers share one union-regex pass over the cache
+    marker_hits = scan_repo_markers(file_cache) if _phase_references_markers(text) else {}
+
+    # Detectors (phase-scoped), plus proactive repo-wide audits (policy/ports/CI) when enabled
+    detectors: List[Callable[[], List[Finding]]] = [
+        lambda: detect_semantic_duplicates(text, file_cache, file_bows),
+        lambda: detect_architectural_conflicts(text, file_cache, marker_hits),
+        lambda: detect_missing_dependencies(text, file_cache, requirements_cache),
+        lambda: detect_blind_spots(text, file_cache, marker_hits),
+    ]
     if proactive:
-        try:
-            findings.extend(detect_ci_policy_gaps(text, repo_root))
-        except Exception:
-            pass
-        try:
-            findings.extend(detect_port_collisions(repo_root))
-        except Exception:
-            pass
-        try:
-            require_nr = re.search(r"non[- ]root|uid:gid|user\s+10001", text, re.I) is not None
-            require_tini = re.search(r"\btini\b", text, re.I) is not None
-            if require_nr or require_tini:
-                findings.extend(detect_global_docker_policies(repo_root, require_nr, require_tini))
-        except Exception:
-            pass
+        require_nr = POLICY_MARKERS["non_root"].search(text) is not None
+        require_tini = POLICY_MARKERS["tini"].search(text) is not None
+        detectors.append(lambda: detect_ci_policy_gaps(text, repo_root, file_cache))
+        detectors.append(lambda: detect_port_collisions(repo_root))
+        if require_nr or require_tini:
+            detectors.append(lambda: detect_global_docker_policies(dockerfiles_cache, require_nr, require_tini))
+
+    # Detectors only read the shared caches, so run them concurrently; results are
+    # collected in submission order to keep the report deterministic
+    with ThreadPoolExecutor(max_workers=min(len(detectors), os.cpu_count() or 1)) as ex:
+        futures = [ex.submit(d) for d in detectors]
+        for fut in futures:
+            try:
+                findings.extend(fut.result() or [])
+            except Exception:
+                pass
 
     # De-duplicate similar findings by (category, severity, description)
     bucket: Dict[Tuple[str, str, str], List[Evidence]] = {}
@@ -600,17 +949,23 @@ def analyze_phase(tasks: List[Dict[str, object]], phase_index: int, repo_root: P
     }
 
 
+def _json_loads(raw: Union[bytes, str]) -> object:
+    if ORJSON_AVAILABLE:
+        return orjson.loads(raw)
+    return json.loads(raw.decode("utf-8") if isinstance(raw, bytes) else raw)
+
+
 def load_tasks_from_args(tasks_file: Optional[str], tasks_json: Optional[str]) -> List[Dict[str, object]]:
     if not tasks_file and not tasks_json:
         raise SystemExit("Provide --tasks-file or --tasks-json")
     data: object
     if tasks_json:
-        data = json.loads(tasks_json)
+        data = _json_loads(tasks_json)
     else:
         path = Path(tasks_file)  # type: ignore[arg-type]
         if not path.exists():
             raise SystemExit(f"tasks file not found: {path}")
-        data = json.loads(path.read_text(encoding="utf-8"))
+        data = _json_loads(path.read_bytes())
     if isinstance(data, dict) and "tasks" in data:
         data = data["tasks"]
     if not isinstance(data, list):
@@ -641,6 +996,7 @@ def main() -> None:
     ap.add_argument("--repo-root", required=False, help="Path to repository root (auto-detected if omitted)")
     ap.add_argument("--output", help="Optional output JSON file path", default=None)
     ap.add_argument("--proactive", action="store_true", help="Enable proactive repo-wide audits (CI, ports, global Dockerfile policies)")
+    ap.add_argument("--no-token-cache", action="store_true", help="Do not read or write <repo_root>/.cache/analyzer/tokens.sqlite")
     args = ap.parse_args()
 
     repo_root = Path(args.repo_root) if args.repo_root else _detect_repo_root()
@@ -649,7 +1005,7 @@ def main() -> None:
 
     tasks = load_tasks_from_args(args.tasks_file or str(repo_root / "memory-bank" / "queue-system" / "tasks_active.json"), args.tasks_json)
 
-    report = analyze_phase(tasks, args.phase_index, repo_root, proactive=args.proactive)
+    report = analyze_phase(tasks, args.phase_index, repo_root, proactive=args.proactive, use_token_cache=not args.no_token_cache)
     out_text = json.dumps(report, indent=2, ensure_ascii=False)
     if args.output:
         Path(args.output).write_text(out_text, encoding="utf-8")
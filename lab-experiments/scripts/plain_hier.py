@@ -3,6 +3,13 @@
 import json, sys, re, os, subprocess, argparse
 from pathlib import Path
 
+# Optional: faster JSON parsing straight from bytes
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 def _find_root_with_tasks(start: Path):
     cur = start.resolve()
     while True:
@@ -13,6 +20,16 @@ def _find_root_with_tasks(start: Path):
         cur = cur.parent
     return None
 
+def _find_dotgit(start: Path):
+    cur = start.resolve()
+    while True:
+        if (cur / ".git").exists():
+            return cur
+        if cur.parent == cur:
+            break
+        cur = cur.parent
+    return None
+
 def _detect_repo_root() -> Path:
     cwd = Path.cwd()
     # 1) Search upwards from current working directory
@@ -24,27 +41,52 @@ def _detect_repo_root() -> Path:
     root = _find_root_with_tasks(here)
     if root:
         return root
-    # 3) Try git repository top-level
-    try:
-        top = subprocess.check_output([
-            "git", "rev-parse", "--show-toplevel"
-        ], stderr=subprocess.DEVNULL).decode().strip()
+    # 3) Git top-level: $GIT_TOP when CI provides it, else a .git directory walk;
+    #    git itself is only spawned when .git is a file (worktree/submodule)
+    top = os.environ.get("GIT_TOP")
+    dotgit = None if top else _find_dotgit(cwd)
+    if dotgit is not None and not (dotgit / ".git").is_dir():
+        try:
+            top = subprocess.check_output([
+                "git", "rev-parse", "--show-toplevel"
+            ], stderr=subprocess.DEVNULL).decode().strip()
+        except Exception:
+            pass
+    elif dotgit is not None:
+        top = str(dotgit)
+    if top:
         root = _find_root_with_tasks(Path(top))
         if root:
             return root
-    except Exception:
-        pass
     # 4) Fallback to cwd
     return cwd
 
 REPO_ROOT = _detect_repo_root()
 ACTIVE = REPO_ROOT / "memory-bank" / "queue-system" / "tasks_active.json"
 
+_BLOCK_RE = re.compile(r"```(?:[\w+-]+)?\n([\s\S]*?)\n```", re.M)
+_WS_RE = re.compile(r"\s*")
+# The boundaries str.splitlines() splits on
+_LINE_BREAK_RE = re.compile("[\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029]")
+
+def _json_loads(raw: bytes):
+    if ORJSON_AVAILABLE:
+        return orjson.loads(raw)
+    return json.loads(raw.decode("utf-8"))
+
 def blocks(md: str):
-    return re.findall(r"```(?:[\w+-]+)?\n([\s\S]*?)\n```", md or "", re.M)
+    # lazy: callers that only need the first block stop the scan there
+    return (m.group(1) for m in _BLOCK_RE.finditer(md or ""))
 
 def head(line: str) -> str:
-    return (line or "").strip().splitlines()[0] if line else ""
+    # Same as text.strip().splitlines()[0] without copying and splitting the whole text
+    if not line: return ""
+    ws = _WS_RE.match(line)  # \s* always matches; the check is for the type checker
+    start = ws.end() if ws else 0
+    br = _LINE_BREAK_RE.search(line, start)
+    if br is None or _WS_RE.fullmatch(line, br.start()):
+        return line[start:br.start() if br else len(line)].rstrip()
+    return line[start:br.start()]
 
 def main():
     ap = argparse.ArgumentParser(description="Plain hierarchy viewer")
@@ -55,7 +97,7 @@ def main():
     global ACTIVE
     ACTIVE = REPO_ROOT / "memory-bank" / "queue-system" / ("analysis_active.json" if args.mode=="analysis" else "tasks_active.json")
     task_id = args.task_id
-    data = json.loads(ACTIVE.read_text(encoding="utf-8"))
+    data = _json_loads(ACTIVE.read_bytes())
     if isinstance(data, dict) and "tasks" in data:
         data = data["tasks"]
     task = next((t for t in data if t.get("id")==task_id), None)
@@ -73,9 +115,10 @@ def main():
         if note_idx >= 0:
             snippet = td["text"][note_idx:note_idx+220].replace("\n"," ")
             print(f"     NOTE: {snippet}{'…' if len(td['text'])-note_idx>220 else ''}")
-        code = blocks(td.get("text",""))
-        if code:
-            prev = "\n".join(code[0].splitlines()[:4])
+        # Only the first fenced block is previewed
+        first = next(blocks(td.get("text","")), None)
+        if first is not None:
+            prev = "\n".join(first.splitlines()[:4])
             print("     cmds:")
             for ln in prev.splitlines():
                 print(f"       {ln}")
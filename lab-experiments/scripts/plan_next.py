@@ -2,7 +2,14 @@
 """Plan next-phase helper (environment-independent path auto-detection)."""
 import json, re, sys, os, subprocess, argparse
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+
+# Optional: faster JSON parsing straight from bytes
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 def _find_root_with_tasks(start: Path) -> Optional[Path]:
     """Walk upwards from 'start' to locate a directory containing the plan file."""
@@ -15,6 +22,17 @@ def _find_root_with_tasks(start: Path) -> Optional[Path]:
         cur = cur.parent
     return None
 
+def _find_dotgit(start: Path) -> Optional[Path]:
+    """Walk upwards from 'start' to the nearest directory containing .git."""
+    cur = start.resolve()
+    while True:
+        if (cur / ".git").exists():
+            return cur
+        if cur.parent == cur:
+            break
+        cur = cur.parent
+    return None
+
 def _detect_repo_root() -> Path:
     cwd = Path.cwd()
     # 1) Search upwards from current working directory
@@ -26,26 +44,44 @@ def _detect_repo_root() -> Path:
     root = _find_root_with_tasks(here)
     if root:
         return root
-    # 3) Try git repository top-level
-    try:
-        top = subprocess.check_output([
-            "git", "rev-parse", "--show-toplevel"
-        ], stderr=subprocess.DEVNULL).decode().strip()
+    # 3) Git top-level: $GIT_TOP when CI provides it, else a .git directory walk;
+    #    git itself is only spawned when .git is a file (worktree/submodule)
+    top = os.environ.get("GIT_TOP")
+    dotgit = None if top else _find_dotgit(cwd)
+    if dotgit is not None and not (dotgit / ".git").is_dir():
+        try:
+            top = subprocess.check_output([
+                "git", "rev-parse", "--show-toplevel"
+            ], stderr=subprocess.DEVNULL).decode().strip()
+        except Exception:
+            pass
+    elif dotgit is not None:
+        top = str(dotgit)
+    if top:
         root = _find_root_with_tasks(Path(top))
         if root:
             return root
-    except Exception:
-        pass
     # 4) Fallback to cwd (may error later if file truly absent)
     return cwd
 
 REPO_ROOT = _detect_repo_root()
 ACTIVE = REPO_ROOT / "memory-bank" / "queue-system" / "tasks_active.json"
 
+# capture fenced code blocks; language tag optional
+_BLOCK_RE = re.compile(r"```(?:[a-zA-Z0-9_+-]+)?\n([\s\S]*?)\n```", re.MULTILINE)
+_WS_RE = re.compile(r"\s*")
+# The boundaries str.splitlines() splits on
+_LINE_BREAK_RE = re.compile("[\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029]")
+
+def _json_loads(raw: bytes) -> Any:
+    if ORJSON_AVAILABLE:
+        return orjson.loads(raw)
+    return json.loads(raw.decode("utf-8"))
+
 def load_tasks() -> List[Dict[str, Any]]:
     if not ACTIVE.exists():
         print("❌ tasks_active.json not found"); sys.exit(2)
-    data = json.loads(ACTIVE.read_text(encoding="utf-8"))
+    data = _json_loads(ACTIVE.read_bytes())
     if isinstance(data, dict) and "tasks" in data:
         data = data["tasks"]
     if not isinstance(data, list):
@@ -59,18 +95,23 @@ def first_unfinished(todos: List[Dict[str, Any]]) -> Tuple[int, Optional[Dict[st
     return -1, None
 
 def title_line(markdown: str) -> str:
-    return (markdown or "").strip().splitlines()[0] if markdown else ""
+    # Same as text.strip().splitlines()[0] without copying and splitting the whole text
+    if not markdown: return ""
+    ws = _WS_RE.match(markdown)  # \s* always matches; the check is for the type checker
+    start = ws.end() if ws else 0
+    br = _LINE_BREAK_RE.search(markdown, start)
+    if br is None or _WS_RE.fullmatch(markdown, br.start()):
+        return markdown[start:br.start() if br else len(markdown)].rstrip()
+    return markdown[start:br.start()]
 
 def extract_important_note(markdown: str) -> str:
     if not markdown: return ""
     idx = markdown.find("IMPORTANT NOTE:")
     return markdown[idx:].strip() if idx >= 0 else ""
 
-def extract_code_blocks(markdown: str) -> List[str]:
-    if not markdown: return []
-    # capture fenced code blocks; language tag optional
-    p = re.compile(r"```(?:[a-zA-Z0-9_+-]+)?\n([\s\S]*?)\n```", re.MULTILINE)
-    return [m.group(1).strip() for m in p.finditer(markdown)]
+def extract_code_blocks(markdown: str) -> Iterator[str]:
+    # lazy: the preview only needs the first block
+    return (m.group(1).strip() for m in _BLOCK_RE.finditer(markdown or ""))
 
 def lint_plan(task: Dict[str, Any]) -> Dict[str, Any]:
     todos = task.get("todos", [])
@@ -127,9 +168,9 @@ def main():
             print(f"   Title: {title_line(txt)}")
             note = extract_important_note(txt)
             print(f"   IMPORTANT NOTE: {(note[:300] + '…') if len(note) > 300 else (note or '(missing)')}")
-            blocks = extract_code_blocks(txt)
-            if blocks:
-                preview = "\n".join(blocks[0].splitlines()[:12])
+            first = next(extract_code_blocks(txt), None)
+            if first is not None:
+                preview = "\n".join(first.splitlines()[:12])
                 print("   Extracted commands/code (preview):")
                 print("   ---")
                 for line in preview.splitlines():
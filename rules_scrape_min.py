@@ -5,8 +5,23 @@
 import os, time, re, hashlib
 from urllib.parse import urljoin, urlparse
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 
+# Optional: C-backed HTML parser; html.parser is the pure-Python fallback
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+# Optional: fast non-cryptographic content fingerprints
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
 SEEDS = [
     "https://cursor.directory/rules",
     "https://cursor.directory/rules/popular",
@@ -18,15 +33,23 @@ os.makedirs(OUTDIR, exist_ok=True)
 HEADERS = {"User-Agent": "TeteyHarvester/1.0 (+local)"}
 RATE = 1.0  # 1 req/sec (polite)
 
+# One keep-alive session: reuses TCP/TLS connections across the whole crawl
+_SESSION = requests.Session()
+_SESSION.headers.update(HEADERS)
+_SESSION.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=10))
+_SESSION.mount("http://", HTTPAdapter(pool_connections=10, pool_maxsize=10))
+
 def get(url):
     for _ in range(3):
-        r = requests.get(url, headers=HEADERS, timeout=25)
+        r = _SESSION.get(url, timeout=25)
         if r.status_code == 200: return r.text
         time.sleep(2)
     return ""
 
-def discover_links(html, base):
-    soup = BeautifulSoup(html, "html.parser")
+def parse_html(html):
+    return BeautifulSoup(html, HTML_PARSER)
+
+def discover_links(soup, base):
     links = set()
     for a in soup.find_all("a", href=True):
         href = urljoin(base, a["href"])
@@ -37,8 +60,7 @@ def discover_links(html, base):
 def slugify(t):
     return re.sub(r"[^a-zA-Z0-9\- ]+","",t).strip().lower().replace(" ","-")[:90] or "untitled"
 
-def extract_title_body(html):
-    soup = BeautifulSoup(html, "html.parser")
+def extract_title_body(soup):
     h = soup.find(["h1","h2","title"])
     title = (h.get_text(" ", strip=True) if h else "Untitled Rule")
     main = soup.find(["main","article"]) or soup
@@ -51,8 +73,13 @@ def extract_title_body(html):
 
 def norm(s): return " ".join(s.lower().split())
 
+def fingerprint(s):
+    # dedupe key only; tagged so it is never mistaken for a sha1 digest
+    if XXHASH_AVAILABLE: return "xxh128:" + xxhash.xxh128(s.encode()).hexdigest()
+    return hashlib.sha1(s.encode()).hexdigest()
+
 def to_mdc(url, title, body):
-    h = hashlib.sha1(norm(body).encode()).hexdigest()
+    h = fingerprint(norm(body))
     bullets = [f"- {ln}" for ln in body.split("\n") if ln.strip()][:20]
     return h, f"""%% source_url: {url}
 %% last_fetched: (local)
@@ -75,13 +102,14 @@ def main():
         html = get(url); time.sleep(RATE)
         if not html: continue
 
-        # discover more /rules/* links
-        for link in discover_links(html, url):
+        # discover more /rules/* links; parse once for discovery and extraction
+        soup = parse_html(html)
+        for link in discover_links(soup, url):
             if link not in visited: queue.add(link)
 
         # save only deeper /rules/* pages (likely detail pages)
         if "/rules/" in url and url.count("/") >= 4:
-            title, body = extract_title_body(html)
+            title, body = extract_title_body(soup)
             if len(body) < 60:  # skip sobrang ikli
                 continue
             h, mdc = to_mdc(url, title, body)
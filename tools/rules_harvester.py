@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
-import os, time, hashlib, re, json
+import os, time, hashlib, re, json, threading
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urljoin, urlparse
 import urllib.request
 import urllib.error
@@ -7,28 +8,71 @@ import ssl
 from bs4 import BeautifulSoup
 from datetime import datetime
 
+# Optional: C-backed HTML parser; html.parser is the pure-Python fallback
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+# Optional: fast non-cryptographic content fingerprints
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+# Optional: faster JSON (de)serialization straight to/from bytes
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 SEEDS_FILE = "tools/rules_seeds.txt"
 OUTDIR = ".cursor/rules/harvested"
 INDEX = os.path.join(OUTDIR, "_index.json")
 os.makedirs(OUTDIR, exist_ok=True)
 
 HEADERS = {"User-Agent": "TeteyHarvester/1.0 (+local)"}
-RATE_SEC = 1.0  # polite crawl
+RATE_SEC = 1.0  # polite crawl, per host
+MAX_WORKERS = 8  # concurrent fetches
+SAVE_EVERY = 20  # persist the index after this many new entries
+
+# Permissive SSL context, built once: loading the CA bundle per request is costly
+_SSL_CTX = ssl.create_default_context()
+_SSL_CTX.check_hostname = False
+_SSL_CTX.verify_mode = ssl.CERT_NONE
 
 def load_seeds():
     with open(SEEDS_FILE, "r", encoding="utf-8") as f:
         return [ln.strip() for ln in f if ln.strip() and not ln.startswith("#")]
 
+class HostRateLimiter:
+    """Spaces requests to the same host at least `interval` seconds apart across threads."""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next = {}
+
+    def wait(self, url):
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next.get(host, now))
+            self._next[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+_RATE_LIMITER = HostRateLimiter(RATE_SEC)
+
 def get(url):
     for attempt in range(3):
+        _RATE_LIMITER.wait(url)
         try:
-            # Create SSL context that's more permissive
-            context = ssl.create_default_context()
-            context.check_hostname = False
-            context.verify_mode = ssl.CERT_NONE
-            
             req = urllib.request.Request(url, headers=HEADERS)
-            with urllib.request.urlopen(req, timeout=10, context=context) as response:
+            with urllib.request.urlopen(req, timeout=10, context=_SSL_CTX) as response:
                 if response.status == 200:
                     content = response.read().decode('utf-8')
                     return content
@@ -39,8 +83,10 @@ def get(url):
     print(f"[ERROR] Failed to fetch {url} after 3 attempts")
     return ""
 
-def discover_rule_links(html, base):
-    soup = BeautifulSoup(html, "html.parser")
+def parse_html(html):
+    return BeautifulSoup(html, HTML_PARSER)
+
+def discover_rule_links(soup, base):
     links = set()
     for a in soup.find_all("a", href=True):
         href = urljoin(base, a["href"])
@@ -54,9 +100,7 @@ def slugify(title):
     s = re.sub(r"[^a-zA-Z0-9\- ]+", "", title).strip().lower().replace(" ", "-")
     return s[:90] or "untitled"
 
-def extract_title_body(html):
-    soup = BeautifulSoup(html, "html.parser")
-    
+def extract_title_body(soup):
     # Look for the specific code block that contains the rules
     code_block = soup.find("code", class_="text-sm block pr-3")
     if code_block:
@@ -82,9 +126,18 @@ def extract_title_body(html):
 def norm_text(s: str) -> str:
     return " ".join(s.lower().split())
 
+def legacy_fingerprint(normalized: str) -> str:
+    return hashlib.sha1(normalized.encode()).hexdigest()
+
+def fingerprint(normalized: str) -> str:
+    # xxh128 digests carry an algorithm tag; untagged digests in older indices are sha1
+    if XXHASH_AVAILABLE:
+        return "xxh128:" + xxhash.xxh128(normalized.encode()).hexdigest()
+    return legacy_fingerprint(normalized)
+
 def mdc_from(url, title, body):
     normalized = norm_text(body)
-    h = hashlib.sha1(normalized.encode()).hexdigest()
+    h = fingerprint(normalized)
     bullets = [f"- {ln}" for ln in body.split("\n") if ln.strip()]
     bullets = bullets[:20]  # trim noise
     today = datetime.utcnow().strftime("%Y-%m-%d")
@@ -109,11 +162,19 @@ def mdc_from(url, title, body):
 
 def load_index():
     if os.path.exists(INDEX):
-        with open(INDEX, "r", encoding="utf-8") as f: return json.load(f)
+        with open(INDEX, "rb") as f: raw = f.read()
+        return orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw.decode("utf-8"))
     return {"entries": []}
 
 def save_index(ix):
-    with open(INDEX, "w", encoding="utf-8") as f: json.dump(ix, f, indent=2)
+    # Write a temp file and rename over INDEX so a crash never leaves it half-written
+    if ORJSON_AVAILABLE:
+        data = orjson.dumps(ix, option=orjson.OPT_INDENT_2)
+    else:
+        data = json.dumps(ix, indent=2).encode("utf-8")
+    tmp = INDEX + ".tmp"
+    with open(tmp, "wb") as f: f.write(data)
+    os.replace(tmp, INDEX)
 
 def already_have(ix, h):
     return any(e.get("hash")==h for e in ix["entries"])
@@ -125,46 +186,61 @@ def main():
     visited, queue = set(), set(load_seeds())
     print(f"[INFO] Loaded {len(queue)} seed URLs")
     seen_hashes = set(e["hash"] for e in ix["entries"])
+    # Entries saved before fingerprints were tagged can only be matched by sha1
+    check_legacy = XXHASH_AVAILABLE and any(":" not in h for h in seen_hashes)
 
     max_iterations = 100  # Increased significantly to allow more harvesting
     iteration = 0
-
-    while queue and iteration < max_iterations:
-        iteration += 1
-        if iteration % 10 == 0:
-            print(f"[INFO] Progress: {iteration}/{max_iterations}, Queue size: {len(queue)}")
-        url = queue.pop()
-        if url in visited: continue
-        visited.add(url)
-
-        html = get(url); time.sleep(RATE_SEC)
-        if not html: continue
-
-        discovered_links = discover_rule_links(html, url)
-        print(f"[INFO] Discovered {len(discovered_links)} links from {url}")
+    new_entries = 0
+
+    # Fetch a batch of URLs in parallel (the rate limiter keeps each host polite),
+    # then parse and update the queue/index on this thread only
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex:
+        while queue and iteration < max_iterations:
+            batch = []
+            while queue and len(batch) < MAX_WORKERS and iteration < max_iterations:
+                iteration += 1
+                if iteration % 10 == 0:
+                    print(f"[INFO] Progress: {iteration}/{max_iterations}, Queue size: {len(queue)}")
+                url = queue.pop()
+                if url in visited: continue
+                visited.add(url)
+                batch.append(url)
+
+            for url, html in zip(batch, ex.map(get, batch)):
+                if not html: continue
+
+                # Parse once; link discovery and extraction share the tree
+                soup = parse_html(html)
+                discovered_links = discover_rule_links(soup, url)
+                print(f"[INFO] Discovered {len(discovered_links)} links from {url}")
         
-        # Only add a limited number of links to prevent queue explosion
-        added_count = 0
-        for link in discovered_links:
-            if link not in visited and added_count < 3 and len(queue) < 50:  # Limit additions
-                queue.add(link)
-                added_count += 1
-
-        # Try to harvest content from any page that might contain rules
-        if "/rules/" in url or "/data-" in url or "/cursor-rules" in url:
-            title, body = extract_title_body(html)
-            # Check if we found content in the code block (indicates actual rule content)
-            if len(body) > 100 and "You are an expert" in body:  # Look for rule signature
-                h, mdc = mdc_from(url, title, body)
-                if h in seen_hashes: continue
-                seen_hashes.add(h)
-                outpath = os.path.join(OUTDIR, f"{slugify(title)}.mdc")
-                with open(outpath, "w", encoding="utf-8") as f:
-                    f.write(mdc)
-                ix["entries"].append({"title": title, "url": url, "hash": h, "file": outpath})
-                print(f"[saved] {title} -> {outpath}")
-            elif len(body) > 100:
-                print(f"[INFO] Found content but not a rule: {title} ({len(body)} chars)")
+                # Only add a limited number of links to prevent queue explosion
+                added_count = 0
+                for link in discovered_links:
+                    if link not in visited and added_count < 3 and len(queue) < 50:  # Limit additions
+                        queue.add(link)
+                        added_count += 1
+
+                # Try to harvest content from any page that might contain rules
+                if "/rules/" in url or "/data-" in url or "/cursor-rules" in url:
+                    title, body = extract_title_body(soup)
+                    # Check if we found content in the code block (indicates actual rule content)
+                    if len(body) > 100 and "You are an expert" in body:  # Look for rule signature
+                        h, mdc = mdc_from(url, title, body)
+                        if h in seen_hashes: continue
+                        if check_legacy and legacy_fingerprint(norm_text(body)) in seen_hashes: continue
+                        seen_hashes.add(h)
+                        outpath = os.path.join(OUTDIR, f"{slugify(title)}.mdc")
+                        with open(outpath, "w", encoding="utf-8") as f:
+                            f.write(mdc)
+                        ix["entries"].append({"title": title, "url": url, "hash": h, "file": outpath})
+                        print(f"[saved] {title} -> {outpath}")
+                        new_entries += 1
+                        if new_entries % SAVE_EVERY == 0:
+                            save_index(ix)
+                    elif len(body) > 100:
+                        print(f"[INFO] Found content but not a rule: {title} ({len(body)} chars)")
 
     save_index(ix)
     print(f"[done] total harvested: {len(ix['entries'])}")
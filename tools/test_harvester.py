@@ -4,32 +4,48 @@ import urllib.error
 import ssl
 import time
 
+# Custom SSL context for method 1, built once instead of per tested URL
+_SSL_CTX = ssl.create_default_context()
+_SSL_CTX.check_hostname = False
+_SSL_CTX.verify_mode = ssl.CERT_NONE
+
+HEADERS = {'User-Agent': 'TeteyHarvester/1.0'}
+PROBE_BYTES = 1024  # body bytes read when a server refuses HEAD
+
+def probe(url, context=None):
+    """Return (status, content length) using HEAD; falls back to a GET read capped at PROBE_BYTES."""
+    try:
+        req = urllib.request.Request(url, headers=HEADERS, method="HEAD")
+        with urllib.request.urlopen(req, timeout=10, context=context) as response:
+            return response.status, response.headers.get("Content-Length", "unknown")
+    except urllib.error.HTTPError as e:
+        if e.code not in (405, 501):  # HEAD not allowed / not implemented
+            raise
+    req = urllib.request.Request(url, headers=HEADERS)
+    with urllib.request.urlopen(req, timeout=10, context=context) as response:
+        response.read(PROBE_BYTES)
+        return response.status, response.headers.get("Content-Length", "unknown")
+
 def test_url(url):
     print(f"\n=== Testing {url} ===")
     
     # Method 1: urllib with custom context
     try:
         print("Method 1: urllib with custom SSL context")
-        context = ssl.create_default_context()
-        context.check_hostname = False
-        context.verify_mode = ssl.CERT_NONE
-        
-        req = urllib.request.Request(url, headers={'User-Agent': 'TeteyHarvester/1.0'})
-        with urllib.request.urlopen(req, timeout=10, context=context) as response:
-            print(f"Status: {response.status}")
-            print(f"Content length: {len(response.read())}")
-            return True
+        status, length = probe(url, context=_SSL_CTX)
+        print(f"Status: {status}")
+        print(f"Content length: {length}")
+        return True
     except Exception as e:
         print(f"Method 1 failed: {e}")
     
-    # Method 2: Simple urllib
+    # Method 2: Simple urllib (only reached when method 1 failed)
     try:
         print("Method 2: Simple urllib")
-        req = urllib.request.Request(url, headers={'User-Agent': 'TeteyHarvester/1.0'})
-        with urllib.request.urlopen(req, timeout=10) as response:
-            print(f"Status: {response.status}")
-            print(f"Content length: {len(response.read())}")
-            return True
+        status, length = probe(url)
+        print(f"Status: {status}")
+        print(f"Content length: {length}")
+        return True
     except Exception as e:
         print(f"Method 2 failed: {e}")
     